@@ -0,0 +1,207 @@
+# ============================================================================
+# BUILD ROOT CAUSE AGGREGATES - ONE-TIME DATA PREPARATION
+# ============================================================================
+# The Root Cause page only shows a few dozen summary rows (severity buckets,
+# worst airports, day of week, hourly and carrier averages). They are computed
+# here once from flights.parquet and saved to aggregates.parquet, so the page
+# never has to scan the full dataset.
+#
+# Run after build_parquet.py, and again whenever flights.parquet changes:
+#     python build_aggregates.py
+# ============================================================================
+
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+PARQUET_PATH = 'flights.parquet'
+AGGREGATES_PATH = 'aggregates.parquet'
+
+# Only the columns the summaries need are read
+COLUMNS = [
+    'AIRLINE', 'ORIGIN_AIRPORT', 'DESTINATION_AIRPORT', 'DAY_OF_WEEK',
+    'DEPARTURE_HOUR', 'DEPARTURE_DELAY', 'ARRIVAL_DELAY', 'WEATHER_DELAY', 'CANCELLED'
+]
+
+# One long table - KIND says which summary a row belongs to and KEY is the
+# label within it (bucket, airport, day, hour or airline). KEY is always a
+# display string: DEPARTURE_HOUR rows store the hour as '0' - '23', and the
+# app shows it as-is without parsing it back. Delay columns hold averages,
+# except on the DELAYED_TOTAL row where they hold total minutes.
+AGGREGATE_COLUMNS = ['KIND', 'KEY', 'FLIGHTS', 'DEPARTURE_DELAY', 'ARRIVAL_DELAY', 'WEATHER_DELAY']
+
+# Severity buckets are (0, 15], (15, 30], ... like the old pd.cut bins
+DELAY_LABELS = ['Minor (0-15m)', 'Moderate (15-30m)', 'Significant (30-60m)',
+                'Major (1-2h)', 'Severe (>2h)']
+DELAY_EDGES = np.array([15, 30, 60, 120], dtype=np.float32)
+
+# Schema metadata keys recording which flights.parquet the summaries came
+# from - the dashboard refuses to show them if that file has changed since
+SOURCE_MTIME_KEY = b'source_mtime_ns'
+SOURCE_SIZE_KEY = b'source_size'
+
+DAY_ORDER = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+
+def grouped_count_mean(keys, values, n_groups):
+    """
+    Row count and mean of values for each integer key 0..n_groups-1
+    Two bincount passes instead of a hash groupby - empty groups get a NaN mean
+    """
+    counts = np.bincount(keys, minlength=n_groups)
+    sums = np.bincount(keys, weights=values, minlength=n_groups)
+    with np.errstate(invalid='ignore'):
+        return counts, sums / counts
+
+
+def delay_severity(df_delayed):
+    """
+    Number of delayed flights per severity bucket
+    """
+    # side='left' keeps a delay of exactly 15 min in the first bucket
+    codes = np.searchsorted(DELAY_EDGES, df_delayed['ARRIVAL_DELAY'].to_numpy(), side='left')
+    return pd.DataFrame({
+        'KIND': 'SEVERITY',
+        'KEY': DELAY_LABELS,
+        'FLIGHTS': np.bincount(codes, minlength=len(DELAY_LABELS))
+    })
+
+
+def delayed_totals(df_delayed):
+    """
+    Delayed flight count with total arrival and weather delay minutes
+    """
+    return pd.DataFrame({
+        'KIND': ['DELAYED_TOTAL'],
+        'KEY': ['ALL'],
+        'FLIGHTS': [len(df_delayed)],
+        'ARRIVAL_DELAY': [df_delayed['ARRIVAL_DELAY'].to_numpy().sum(dtype=np.float64)],
+        'WEATHER_DELAY': [df_delayed['WEATHER_DELAY'].to_numpy().sum(dtype=np.float64)]
+    })
+
+
+def worst_airports(df_active, airport_col, delay_col, min_flights=100, top_n=10):
+    """
+    Top airports by average delay, among airports with at least min_flights
+    e.g. airport_col='ORIGIN_AIRPORT', delay_col='DEPARTURE_DELAY'
+    """
+    # One bincount pass over the airport category codes gives every airport's
+    # flight count and delay sum at once
+    airport = df_active[airport_col].cat
+    counts, means = grouped_count_mean(
+        airport.codes.to_numpy(), df_active[delay_col].to_numpy(), len(airport.categories)
+    )
+
+    # Apply the minimum on the small per-airport count array, before any frame exists
+    keep = np.flatnonzero(counts >= min_flights)
+    avg_delay = means[keep]
+
+    # Pick the worst with a partial selection, then sort only those
+    n = min(top_n, keep.size)
+    top = np.argpartition(-avg_delay, n - 1)[:n] if n > 0 else np.empty(0, dtype=np.intp)
+    top = keep[top[np.argsort(-avg_delay[top])]]
+
+    return pd.DataFrame({
+        'KIND': airport_col,
+        'KEY': airport.categories[top].astype(str),
+        'FLIGHTS': counts[top],
+        delay_col: means[top]
+    })
+
+
+def day_of_week_stats(df_active):
+    """
+    Flights and average departure/arrival delay per day of week, Monday first
+    """
+    # DAY_OF_WEEK runs 1 (Monday) to 7 (Sunday), so 8 groups come back
+    # already in order (slot 0 unused)
+    dow = df_active['DAY_OF_WEEK'].to_numpy()
+    counts, dep_means = grouped_count_mean(dow, df_active['DEPARTURE_DELAY'].to_numpy(), 8)
+    _, arr_means = grouped_count_mean(dow, df_active['ARRIVAL_DELAY'].to_numpy(), 8)
+
+    return pd.DataFrame({
+        'KIND': 'DAY_OF_WEEK',
+        'KEY': DAY_ORDER,
+        'FLIGHTS': counts[1:],
+        'DEPARTURE_DELAY': dep_means[1:],
+        'ARRIVAL_DELAY': arr_means[1:]
+    })
+
+
+def hourly_delays(df_active):
+    """
+    Flights and average departure delay per scheduled departure hour
+    """
+    counts, means = grouped_count_mean(
+        df_active['DEPARTURE_HOUR'].to_numpy(), df_active['DEPARTURE_DELAY'].to_numpy(), 24
+    )
+    seen = np.flatnonzero(counts > 0)
+
+    return pd.DataFrame({
+        'KIND': 'DEPARTURE_HOUR',
+        'KEY': seen.astype(str),
+        'FLIGHTS': counts[seen],
+        'DEPARTURE_DELAY': means[seen]
+    })
+
+
+def carrier_delays(df_active):
+    """
+    Flights and average arrival delay per airline, best carrier first
+    """
+    # Group on the categorical's integer codes, then label the airlines that have flights
+    airline = df_active['AIRLINE'].cat
+    counts, means = grouped_count_mean(
+        airline.codes.to_numpy(), df_active['ARRIVAL_DELAY'].to_numpy(), len(airline.categories)
+    )
+    seen = np.flatnonzero(counts > 0)
+    seen = seen[np.argsort(means[seen], kind='stable')]
+
+    return pd.DataFrame({
+        'KIND': 'AIRLINE',
+        'KEY': airline.categories[seen].astype(str),
+        'FLIGHTS': counts[seen],
+        'ARRIVAL_DELAY': means[seen]
+    })
+
+
+def build_aggregates(parquet_path=PARQUET_PATH, aggregates_path=AGGREGATES_PATH):
+    """
+    Read flights.parquet once, compute every Root Cause summary and write
+    them out together as one small Parquet file
+    """
+    source = os.stat(parquet_path)
+    df = pd.read_parquet(parquet_path, engine='pyarrow', columns=COLUMNS)
+
+    # Non-cancelled flights, and the subset of those that arrived late
+    active_mask = df['CANCELLED'].to_numpy() == 0
+    df_active = df[active_mask]
+    df_delayed = df[active_mask & (df['ARRIVAL_DELAY'].to_numpy() > 0)]
+
+    agg = pd.concat([
+        delay_severity(df_delayed),
+        delayed_totals(df_delayed),
+        worst_airports(df_active, 'ORIGIN_AIRPORT', 'DEPARTURE_DELAY'),
+        worst_airports(df_active, 'DESTINATION_AIRPORT', 'ARRIVAL_DELAY'),
+        day_of_week_stats(df_active),
+        hourly_delays(df_active),
+        carrier_delays(df_active)
+    ], ignore_index=True)[AGGREGATE_COLUMNS]
+
+    # Stamp the source file's identity into the schema metadata
+    table = pa.Table.from_pandas(agg, preserve_index=False)
+    table = table.replace_schema_metadata({
+        **table.schema.metadata,
+        SOURCE_MTIME_KEY: str(source.st_mtime_ns).encode(),
+        SOURCE_SIZE_KEY: str(source.st_size).encode()
+    })
+    pq.write_table(table, aggregates_path)
+    return agg
+
+
+if __name__ == '__main__':
+    agg = build_aggregates()
+    print(f"✅ Wrote {len(agg):,} summary rows to {AGGREGATES_PATH}")
@@ -0,0 +1,90 @@
+# ============================================================================
+# BUILD FLIGHTS PARQUET - ONE-TIME DATA PREPARATION
+# ============================================================================
+# Converts the raw Kaggle flights.csv into flights.parquet so the dashboard
+# never has to tokenize the ~500MB CSV on a cold start. All derived columns
+# are computed here once, so the app only has to read the file.
+#
+# Run once after downloading the dataset:
+#     python build_parquet.py
+# ============================================================================
+
+import pandas as pd
+
+CSV_PATH = 'flights.csv'
+PARQUET_PATH = 'flights.parquet'
+
+# Smallest dtype that safely holds each column (default would be int64/float64)
+COMPACT_DTYPES = {
+    'MONTH': 'int8',
+    'DAY': 'int8',
+    'DAY_OF_WEEK': 'int8',
+    'CANCELLED': 'int8',
+    'DEPARTURE_DELAY': 'float32',
+    'ARRIVAL_DELAY': 'float32',
+    'AIR_SYSTEM_DELAY': 'float32',
+    'SECURITY_DELAY': 'float32',
+    'AIRLINE_DELAY': 'float32',
+    'LATE_AIRCRAFT_DELAY': 'float32',
+    'WEATHER_DELAY': 'float32',
+    'DEPARTURE_HOUR': 'int8',
+    'ARRIVAL_HOUR': 'int8',
+    'DEPARTURE_HOUR_DECIMAL': 'float32',
+    'ARRIVAL_HOUR_DECIMAL': 'float32',
+}
+
+# Repeated string codes are stored once per value with small integer codes
+CATEGORY_COLUMNS = ['AIRLINE', 'ORIGIN_AIRPORT', 'DESTINATION_AIRPORT', 'TAIL_NUMBER']
+
+
+def build_parquet(csv_path=CSV_PATH, parquet_path=PARQUET_PATH):
+    """
+    Read the raw CSV once, add the derived columns and write it out as Parquet
+    """
+    # Airport codes are numeric IDs for October and IATA letters elsewhere,
+    # so read them as strings to keep each column a single type
+    df = pd.read_csv(csv_path, dtype={'ORIGIN_AIRPORT': str, 'DESTINATION_AIRPORT': str})
+
+    # Create proper date column
+    df['DATE'] = pd.to_datetime(df[['YEAR', 'MONTH', 'DAY']])
+
+    # Fill missing delay values with 0
+    df['DEPARTURE_DELAY'] = df['DEPARTURE_DELAY'].fillna(0)
+    df['ARRIVAL_DELAY'] = df['ARRIVAL_DELAY'].fillna(0)
+
+    # Create hour column from scheduled departure (e.g., 1435 -> 14)
+    df['DEPARTURE_HOUR'] = (df['SCHEDULED_DEPARTURE'] // 100).clip(0, 23)
+    df['ARRIVAL_HOUR'] = (df['SCHEDULED_ARRIVAL'] // 100).clip(0, 23)
+
+    # Convert times to decimal hours for plotting (e.g., 1430 -> 14.5)
+    df['DEPARTURE_HOUR_DECIMAL'] = (df['SCHEDULED_DEPARTURE'] // 100) + ((df['SCHEDULED_DEPARTURE'] % 100) / 60)
+    df['ARRIVAL_HOUR_DECIMAL'] = (df['SCHEDULED_ARRIVAL'] // 100) + ((df['SCHEDULED_ARRIVAL'] % 100) / 60)
+
+    # Handle midnight crossings (arrival next day)
+    df.loc[df['ARRIVAL_HOUR_DECIMAL'] < df['DEPARTURE_HOUR_DECIMAL'], 'ARRIVAL_HOUR_DECIMAL'] += 24
+
+    # Fill delay cause columns
+    delay_cols = ['AIR_SYSTEM_DELAY', 'SECURITY_DELAY', 'AIRLINE_DELAY',
+                  'LATE_AIRCRAFT_DELAY', 'WEATHER_DELAY']
+    for col in delay_cols:
+        df[col] = df[col].fillna(0)
+
+    # Shrink column dtypes to cut memory and speed up filters/groupbys
+    df = df.astype(COMPACT_DTYPES)
+    for col in CATEGORY_COLUMNS:
+        df[col] = df[col].astype('category')
+
+    df.to_parquet(
+        parquet_path,
+        engine='pyarrow',
+        compression='zstd',
+        row_group_size=200_000,
+        index=False
+    )
+    return df
+
+
+if __name__ == '__main__':
+    df = build_parquet()
+    print(f"✅ Wrote {len(df):,} flights to {PARQUET_PATH}")
+    print(f"📦 In-memory size: {df.memory_usage(deep=True).sum() / 1e6:,.0f} MB")
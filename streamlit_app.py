@@ -5,8 +5,10 @@
 # Perfect portfolio project for operations, logistics, and analyst roles
 # ============================================================================
 
+import os
+import numpy as np
 import pandas as pd
-import plotly.express as px
+import pyarrow.parquet as pq
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import streamlit as st
@@ -66,40 +68,420 @@ AIRLINE_NAMES = {
 # ============================================================================
 # DATA LOADING FUNCTION (with caching for speed)
 # ============================================================================
-@st.cache_data  # This caches the data so it doesn't reload every time
+# Built once from flights.csv by build_parquet.py (derived columns included)
+DATA_FILE = 'flights.parquet'
+
+# Only the columns the three pages actually use are read from disk
+DATA_COLUMNS = [
+    'DATE', 'AIRLINE', 'FLIGHT_NUMBER', 'TAIL_NUMBER',
+    'ORIGIN_AIRPORT', 'DESTINATION_AIRPORT',
+    'SCHEDULED_DEPARTURE', 'SCHEDULED_ARRIVAL',
+    'DEPARTURE_DELAY', 'ARRIVAL_DELAY', 'AIR_TIME', 'DISTANCE', 'CANCELLED',
+    'AIR_SYSTEM_DELAY', 'SECURITY_DELAY', 'AIRLINE_DELAY',
+    'LATE_AIRCRAFT_DELAY', 'WEATHER_DELAY',
+    'DEPARTURE_HOUR', 'DEPARTURE_HOUR_DECIMAL', 'ARRIVAL_HOUR_DECIMAL'
+]
+
+# Safeguard only: build_parquet.py already writes these as categoricals and
+# pyarrow restores them as-is. This keeps them int-coded categoricals if
+# flights.parquet comes from another writer that drops the pandas metadata
+DICTIONARY_COLUMNS = ['AIRLINE', 'ORIGIN_AIRPORT', 'DESTINATION_AIRPORT', 'TAIL_NUMBER']
+
+# cache_resource keeps ONE shared DataFrame per process instead of handing
+# every rerun its own deserialized copy. The app only reads from it -
+# DO NOT modify the returned frame in place (take a .copy() first).
+@st.cache_resource
 def load_data():
     """
     Load and prepare the flight data
     Always loads the complete dataset for full analysis
     """
-    # Load the data
-    df = pd.read_csv('flights.csv')
+    # Load the pre-built parquet file - every derived column is already there
+    table = pq.read_table(DATA_FILE, columns=DATA_COLUMNS, read_dictionary=DICTIONARY_COLUMNS)
+    
+    # Convert column by column and free each Arrow buffer as soon as it's done,
+    # so peak memory is about one copy of the data instead of two
+    df = table.to_pandas(split_blocks=True, self_destruct=True)
+    del table
+    return df
+
+# ============================================================================
+# CACHED FILTERS (so widget changes don't re-scan the full dataset)
+# ============================================================================
+# The leading underscore tells Streamlit not to hash the DataFrame -
+# the cache is keyed on the remaining arguments only (if any)
+@st.cache_data
+def get_airlines(_df):
+    """
+    Sorted list of airline codes in the dataset
+    """
+    return sorted(_df['AIRLINE'].cat.categories.tolist())
+
+@st.cache_data
+def get_date_bounds(_df):
+    """
+    First and last flight date in the dataset
+    """
+    return _df['DATE'].min().date(), _df['DATE'].max().date()
+
+@st.cache_resource  # One shared copy - never modify the returned frame
+def get_departure_index(_df):
+    """
+    Non-cancelled flights indexed by airline, date and departure airport
+    Sorting the index lets lookups binary-search instead of scanning every row
+    """
+    # A raw ndarray mask skips index alignment when selecting rows
+    return _df[_df['CANCELLED'].to_numpy() == 0].set_index(['AIRLINE', 'DATE', 'ORIGIN_AIRPORT']).sort_index()
+
+@st.cache_data
+def get_departure_airports(_df, selected_ts, airline):
+    """
+    Airports the airline departs from on the selected date (a pd.Timestamp)
+    """
+    df_idx = get_departure_index(_df)
+    try:
+        df_filtered = df_idx.loc[(airline, selected_ts)]
+    except KeyError:
+        # Airline has no flights on this date
+        return []
+    return sorted(df_filtered.index.unique())
+
+@st.cache_data
+def get_departures(_df, selected_ts, airline, airport):
+    """
+    Non-cancelled departures for one airline, date and airport,
+    sorted by departure time
+    """
+    df_idx = get_departure_index(_df)
+    try:
+        df_departures = df_idx.loc[(airline, selected_ts, airport)].reset_index()
+    except KeyError:
+        return df_idx.iloc[:0].reset_index()
+    
+    # Sort by departure time
+    return df_departures.sort_values('DEPARTURE_HOUR_DECIMAL')
+
+# ============================================================================
+# CACHED ANALYTICS AGGREGATIONS
+# ============================================================================
+# Keyed on (airlines, start_date, end_date) - pass airlines as a sorted tuple
+# so the key is hashable and doesn't depend on selection order.
+# start_date/end_date are None when no date range is applied.
+@st.cache_resource(max_entries=1)  # Only the latest slice is kept - never modify it
+def get_analytics_slice(_df, airlines, start_date, end_date):
+    """
+    Flights matching the Analytics filters, plus a boolean NumPy mask of the
+    non-cancelled ones among them
+    """
+    # Default filters (every airline, whole date range) keep every row - reuse
+    # the loaded frame instead of pinning a second full copy in the cache
+    min_date, max_date = get_date_bounds(_df)
+    keeps_all_dates = start_date is None or (start_date <= min_date and end_date >= max_date)
+    if keeps_all_dates and set(get_airlines(_df)) <= set(airlines):
+        df_filtered = _df
+    elif start_date is not None:
+        df_filtered = _df[
+            (_df['DATE'] >= pd.to_datetime(start_date)) &
+            (_df['DATE'] <= pd.to_datetime(end_date)) &
+            (_df['AIRLINE'].isin(airlines))
+        ]
+    else:
+        df_filtered = _df[_df['AIRLINE'].isin(airlines)]
+    
+    # Active flights as a mask (1 byte per row) - helpers select just the
+    # columns they need from it, so no full non-cancelled copy stays cached
+    active = df_filtered['CANCELLED'].to_numpy() == 0
+    
+    return df_filtered, active
+
+@st.cache_data
+def get_kpis(_df, airlines, start_date, end_date):
+    """
+    Headline numbers: total flights, cancellations, average delays, on-time rate
+    """
+    df_filtered, active = get_analytics_slice(_df, airlines, start_date, end_date)
+    dep_delay = df_filtered['DEPARTURE_DELAY'].to_numpy()[active]
+    arr_delay = df_filtered['ARRIVAL_DELAY'].to_numpy()[active]
     
-    # Create proper date column
-    df['DATE'] = pd.to_datetime(df[['YEAR', 'MONTH', 'DAY']])
+    total_flights = len(df_filtered)
+    cancelled_flights = df_filtered['CANCELLED'].sum()
+    avg_dep_delay = dep_delay.mean(dtype=np.float64) if dep_delay.size > 0 else np.nan
+    avg_arr_delay = arr_delay.mean(dtype=np.float64) if arr_delay.size > 0 else np.nan
+    ontime_rate = (dep_delay <= 0).sum() / dep_delay.size * 100 if dep_delay.size > 0 else 0
     
-    # Fill missing delay values with 0
-    df['DEPARTURE_DELAY'] = df['DEPARTURE_DELAY'].fillna(0)
-    df['ARRIVAL_DELAY'] = df['ARRIVAL_DELAY'].fillna(0)
+    return total_flights, cancelled_flights, avg_dep_delay, avg_arr_delay, ontime_rate
+
+@st.cache_data
+def get_daily_stats(_df, airlines, start_date, end_date):
+    """
+    Flights, average departure delay and cancellations per day
+    """
+    df_filtered, _ = get_analytics_slice(_df, airlines, start_date, end_date)
     
-    # Create hour column from scheduled departure (e.g., 1435 -> 14)
-    df['DEPARTURE_HOUR'] = (df['SCHEDULED_DEPARTURE'] // 100).clip(0, 23)
-    df['ARRIVAL_HOUR'] = (df['SCHEDULED_ARRIVAL'] // 100).clip(0, 23)
+    daily_stats = df_filtered.groupby('DATE', observed=True).agg({
+        'FLIGHT_NUMBER': 'count',
+        'DEPARTURE_DELAY': 'mean',
+        'CANCELLED': 'sum'
+    }).reset_index()
+    daily_stats.columns = ['DATE', 'Total_Flights', 'Avg_Delay', 'Cancellations']
+    return daily_stats
+
+@st.cache_data
+def get_airline_performance(_df, airlines, start_date, end_date):
+    """
+    Flights and average departure/arrival delay per airline
+    """
+    df_filtered, active = get_analytics_slice(_df, airlines, start_date, end_date)
+    df_active = df_filtered.loc[active, ['AIRLINE', 'FLIGHT_NUMBER', 'DEPARTURE_DELAY', 'ARRIVAL_DELAY']]
     
-    # Convert times to decimal hours for plotting (e.g., 1430 -> 14.5)
-    df['DEPARTURE_HOUR_DECIMAL'] = (df['SCHEDULED_DEPARTURE'] // 100) + ((df['SCHEDULED_DEPARTURE'] % 100) / 60)
-    df['ARRIVAL_HOUR_DECIMAL'] = (df['SCHEDULED_ARRIVAL'] // 100) + ((df['SCHEDULED_ARRIVAL'] % 100) / 60)
+    airline_perf = df_active.groupby('AIRLINE', observed=True).agg({
+        'FLIGHT_NUMBER': 'count',
+        'DEPARTURE_DELAY': 'mean',
+        'ARRIVAL_DELAY': 'mean'
+    }).reset_index()
+    airline_perf.columns = ['Airline', 'Flights', 'Dep_Delay', 'Arr_Delay']
+    return airline_perf.sort_values('Arr_Delay')
+
+@st.cache_data
+def get_hourly_delays(_df, airlines, start_date, end_date):
+    """
+    Average departure delay per scheduled departure hour
+    """
+    df_filtered, active = get_analytics_slice(_df, airlines, start_date, end_date)
+    df_active = df_filtered.loc[active, ['DEPARTURE_HOUR', 'DEPARTURE_DELAY']]
     
-    # Handle midnight crossings (arrival next day)
-    df.loc[df['ARRIVAL_HOUR_DECIMAL'] < df['DEPARTURE_HOUR_DECIMAL'], 'ARRIVAL_HOUR_DECIMAL'] += 24
+    # Hash-group without sorting, then order just the 24 result rows for the line chart
+    hourly = df_active.groupby('DEPARTURE_HOUR', observed=True, sort=False)['DEPARTURE_DELAY'].mean()
+    return hourly.sort_index().reset_index()
+
+@st.cache_data
+def get_delay_causes(_df, airlines, start_date, end_date):
+    """
+    Total delay minutes per cause across delayed flights
+    """
+    df_filtered, active = get_analytics_slice(_df, airlines, start_date, end_date)
     
-    # Fill delay cause columns
-    delay_cols = ['AIR_SYSTEM_DELAY', 'SECURITY_DELAY', 'AIRLINE_DELAY', 
+    cause_cols = ['AIR_SYSTEM_DELAY', 'SECURITY_DELAY', 'AIRLINE_DELAY',
                   'LATE_AIRCRAFT_DELAY', 'WEATHER_DELAY']
-    for col in delay_cols:
-        df[col] = df[col].fillna(0)
     
-    return df
+    # Mask and sum each cause column as its own 1-D array, instead of first
+    # copying every column (or a 2-D block of all five) of the delayed flights
+    delayed = active & (df_filtered['ARRIVAL_DELAY'].to_numpy() > 0)
+    totals = np.array([df_filtered[col].to_numpy()[delayed].sum(dtype=np.float64) for col in cause_cols])
+    return pd.Series(totals, index=cause_cols)
+
+# ============================================================================
+# ROOT CAUSE AGGREGATES (pre-built by build_aggregates.py)
+# ============================================================================
+# The Root Cause page always looks at the full dataset, so its summaries are
+# computed offline once and the page only reads a few dozen rows.
+# Every reader below takes the file's mtime as `version`, so a rebuilt file
+# (and the figures drawn from it) is picked up without restarting the app
+AGGREGATES_FILE = 'aggregates.parquet'
+
+def get_aggregates_version():
+    """
+    Modification time of the aggregates file, or None if it hasn't been built
+    """
+    try:
+        return os.path.getmtime(AGGREGATES_FILE)
+    except FileNotFoundError:
+        return None
+
+def get_data_source():
+    """
+    Identity (mtime in ns, size) of flights.parquet on disk, in the same form
+    build_aggregates.py records for the file it read
+    """
+    stat = os.stat(DATA_FILE)
+    return stat.st_mtime_ns, stat.st_size
+
+@st.cache_data(max_entries=1)
+def get_aggregates_source(version):
+    """
+    Identity (mtime in ns, size) of the flights.parquet the aggregates were
+    built from, read from the file's schema metadata - None if not recorded
+    """
+    metadata = pq.read_schema(AGGREGATES_FILE).metadata or {}
+    # Keys match SOURCE_MTIME_KEY / SOURCE_SIZE_KEY in build_aggregates.py
+    if b'source_mtime_ns' not in metadata or b'source_size' not in metadata:
+        return None
+    return int(metadata[b'source_mtime_ns']), int(metadata[b'source_size'])
+
+@st.cache_resource(max_entries=1)  # One shared copy - never modify the returned frame
+def load_aggregates(version):
+    """
+    Load every Root Cause summary - one row per (KIND, KEY)
+    """
+    return pd.read_parquet(AGGREGATES_FILE, engine='pyarrow')
+
+def get_aggregate(version, kind):
+    """
+    Rows of one summary, in the order build_aggregates.py wrote them
+    """
+    agg = load_aggregates(version)
+    return agg[agg['KIND'] == kind]
+
+def get_delay_severity(version):
+    """
+    Number of delayed flights per severity bucket
+    """
+    severity = get_aggregate(version, 'SEVERITY')
+    return pd.Series(severity['FLIGHTS'].to_numpy(), index=severity['KEY'].to_numpy())
+
+def get_delayed_flight_stats(version):
+    """
+    Delayed flight count, share of severe (>2h) delays, average delay,
+    and total weather vs total arrival delay minutes
+    """
+    totals = get_aggregate(version, 'DELAYED_TOTAL').iloc[0]
+    
+    total_delayed = int(totals['FLIGHTS'])
+    total_delay_mins = totals['ARRIVAL_DELAY']
+    weather_delays = totals['WEATHER_DELAY']
+    
+    # Severe (>2h) delays are exactly the last severity bucket
+    severe_pct = get_delay_severity(version).iloc[-1] * 100.0 / total_delayed
+    avg_delay_delayed = total_delay_mins / total_delayed
+    
+    return total_delayed, severe_pct, avg_delay_delayed, weather_delays, total_delay_mins
+
+def get_worst_airports(version, airport_col, delay_col):
+    """
+    Top 10 airports by average delay, among airports with at least 100 flights
+    e.g. airport_col='ORIGIN_AIRPORT', delay_col='DEPARTURE_DELAY'
+    """
+    airports = get_aggregate(version, airport_col)
+    return pd.DataFrame({
+        'Airport': airports['KEY'].to_numpy(),
+        'Flights': airports['FLIGHTS'].to_numpy(),
+        'Avg_Delay': airports[delay_col].to_numpy()
+    })
+
+def get_day_of_week_stats(version):
+    """
+    Day names, flights and average departure/arrival delay per day of week,
+    Monday first, as plain 7-item lists ready for Plotly
+    """
+    dow = get_aggregate(version, 'DAY_OF_WEEK')
+    return (dow['KEY'].tolist(), dow['FLIGHTS'].tolist(),
+            dow['DEPARTURE_DELAY'].tolist(), dow['ARRIVAL_DELAY'].tolist())
+
+def get_delay_by_hour(version):
+    """
+    Average departure delay per scheduled departure hour, indexed by the
+    hour label ('0' - '23') - only ever displayed, so it stays a string
+    """
+    hourly = get_aggregate(version, 'DEPARTURE_HOUR')
+    return pd.Series(hourly['DEPARTURE_DELAY'].to_numpy(), index=hourly['KEY'].to_numpy())
+
+def get_carrier_delays(version):
+    """
+    Average arrival delay per airline, best carrier first
+    """
+    carriers = get_aggregate(version, 'AIRLINE')
+    return pd.Series(carriers['ARRIVAL_DELAY'].to_numpy(), index=carriers['KEY'].to_numpy())
+
+# ============================================================================
+# CACHED ROOT CAUSE FIGURES
+# ============================================================================
+# The charts only depend on the aggregates above, so each go.Figure is built
+# once per aggregates version and reused - reruns just hand the same object
+# to st.plotly_chart.
+# Shared objects - never modify a returned figure
+@st.cache_resource(max_entries=1)
+def get_severity_figure(version):
+    """
+    Bar chart of delayed flights per severity bucket
+    """
+    delay_dist = get_delay_severity(version)
+    
+    # Plain go.Bar on the arrays - skips plotly.express building a DataFrame
+    counts = delay_dist.to_numpy()
+    fig = go.Figure(go.Bar(
+        x=delay_dist.index.to_numpy(),
+        y=counts,
+        marker=dict(color=counts, colorscale='Reds', showscale=True)
+    ))
+    fig.update_layout(
+        title='How Severe Are the Delays?',
+        xaxis_title='Delay Category',
+        yaxis_title='Number of Flights',
+        height=400,
+        showlegend=False,
+        plot_bgcolor='white'
+    )
+    return fig
+
+@st.cache_resource(max_entries=2)  # Departure and arrival charts
+def get_worst_airports_figure(version, airport_col, delay_col, title, colorscale):
+    """
+    Horizontal bar chart of the 10 worst airports from get_worst_airports
+    """
+    airports = get_worst_airports(version, airport_col, delay_col)
+    
+    avg_delay = airports['Avg_Delay'].to_numpy()
+    fig = go.Figure(go.Bar(
+        x=avg_delay,
+        y=airports['Airport'].to_numpy(),
+        orientation='h',
+        marker=dict(color=avg_delay, colorscale=colorscale, showscale=True)
+    ))
+    fig.update_layout(
+        title=title,
+        xaxis_title='Avg_Delay',
+        yaxis_title='Airport',
+        height=400,
+        plot_bgcolor='white'
+    )
+    return fig
+
+@st.cache_resource(max_entries=1)
+def get_day_of_week_figures(version):
+    """
+    Average delay line chart and flight volume bar chart by day of week
+    """
+    day_order, dow_flights, dow_dep_delay, dow_arr_delay = get_day_of_week_stats(version)
+    
+    delay_fig = go.Figure()
+    delay_fig.add_trace(go.Scatter(
+        x=day_order,
+        y=dow_dep_delay,
+        mode='lines+markers',
+        name='Departure',
+        line=dict(color='#FF9800', width=3),
+        marker=dict(size=10)
+    ))
+    delay_fig.add_trace(go.Scatter(
+        x=day_order,
+        y=dow_arr_delay,
+        mode='lines+markers',
+        name='Arrival',
+        line=dict(color='#F44336', width=3),
+        marker=dict(size=10)
+    ))
+    delay_fig.update_layout(
+        title='Average Delays by Day of Week',
+        xaxis_title='Day',
+        yaxis_title='Average Delay (minutes)',
+        height=400,
+        plot_bgcolor='white'
+    )
+    
+    volume_fig = go.Figure(go.Bar(
+        x=day_order,
+        y=dow_flights,
+        marker=dict(color=dow_flights, colorscale='Blues', showscale=True)
+    ))
+    volume_fig.update_layout(
+        title='Flight Volume by Day of Week',
+        xaxis_title='Day',
+        yaxis_title='Number of Flights',
+        height=400,
+        plot_bgcolor='white',
+        showlegend=False
+    )
+    return delay_fig, volume_fig
 
 # ============================================================================
 # SIDEBAR - DATA LOADING
@@ -115,25 +497,250 @@ with st.spinner('Loading flight data... This may take a minute.'):
     df = load_data()
 
 st.sidebar.success(f"✅ Loaded {len(df):,} flights")
-st.sidebar.markdown(f"📅 Date Range: {df['DATE'].min().strftime('%b %d, %Y')} - {df['DATE'].max().strftime('%b %d, %Y')}")
+min_date, max_date = get_date_bounds(df)
+st.sidebar.markdown(f"📅 Date Range: {min_date.strftime('%b %d, %Y')} - {max_date.strftime('%b %d, %Y')}")
 st.sidebar.markdown("---")
 
-# ============================================================================
-# NAVIGATION - SELECT PAGE
-# ============================================================================
-st.sidebar.title("📊 Navigation")
-page = st.sidebar.radio(
-    "Select Page:",
-    ["🛫 Flight Operations Timeline", "📈 Analytics Dashboard", "🔍 Root Cause Analysis"]
-)
-
-st.sidebar.markdown("---")
-st.sidebar.info("💡 **Tip:** This dashboard demonstrates data analysis and visualization skills for aviation operations roles.")
-
 # ============================================================================
 # PAGE 1: FLIGHT OPERATIONS TIMELINE (SINGLE AIRPORT VIEW)
 # ============================================================================
-if page == "🛫 Flight Operations Timeline":
+@st.fragment  # Widgets in here (e.g. the max flights slider) rerun only this section
+def departure_chart(selected_ts, selected_airline, selected_airport):
+    """
+    Summary metrics, Gantt chart and info boxes for one airline, date and airport
+    """
+    # Filter data: Only DEPARTURES from selected airport, airline, and date
+    df_departures = get_departures(df, selected_ts, selected_airline, selected_airport)
+    
+    if len(df_departures) > 0:
+        # Display summary metrics
+        col1, col2, col3, col4 = st.columns(4)
+        
+        # All four metrics from one array instead of separate pandas reductions
+        delays = df_departures['DEPARTURE_DELAY'].to_numpy()
+        total_flights = delays.size
+        avg_delay = delays.mean(dtype=np.float64)
+        ontime_pct = np.count_nonzero(delays <= 0) * 100.0 / total_flights
+        max_delay = delays.max()
+        
+        col1.metric("Departures", f"{total_flights:,}")
+        col2.metric("Average Delay", f"{avg_delay:.1f} min")
+        col3.metric("On-Time %", f"{ontime_pct:.1f}%")
+        col4.metric("Max Delay", f"{max_delay:.0f} min")
+        
+        st.markdown("---")
+        
+        # Cap the number of bars so busy hubs (thousands of departures) still render quickly
+        max_rows = st.slider(
+            "Max flights to display:",
+            min_value=50,
+            max_value=1000,
+            value=200,
+            step=50,
+            help="Only the earliest departures up to this number are drawn"
+        )
+        if total_flights > max_rows:
+            st.warning(f"⚠️ Showing the first {max_rows:,} of {total_flights:,} departures")
+            df_departures = df_departures.iloc[:max_rows]
+        
+        # Create the chart
+        # VERTICAL SPACING PARAMETERS (Adjust these to change appearance)
+        BAR_HEIGHT = 1.5  # Height of each flight bar
+        SPACE_BETWEEN = 0.5  # Space between bars
+        TOTAL_ROW_HEIGHT = BAR_HEIGHT + SPACE_BETWEEN  # 2.0 total per flight
+        
+        # Get airline color
+        airline_color = AIRLINE_COLORS.get(selected_airline, DEFAULT_COLOR)
+        
+        # Bar positions for all flights at once
+        start_times = df_departures['DEPARTURE_HOUR_DECIMAL'].to_numpy()
+        arrival_times = df_departures['ARRIVAL_HOUR_DECIMAL'].to_numpy()
+        
+        # Clip to 24-hour window
+        continues_next_day = arrival_times > 24
+        end_times = np.minimum(arrival_times, 24)
+        
+        # Calculate Y positions with proper spacing
+        y_centers = np.arange(len(df_departures)) * TOTAL_ROW_HEIGHT
+        
+        # Slightly more transparent for significant delays (> 15 min)
+        opacities = np.where(df_departures['DEPARTURE_DELAY'].to_numpy() > 15, 0.7, 0.85)
+        
+        # Create bar text and hover text for all flights with column-wise string ops
+        d = df_departures
+        flight_ids = selected_airline + d['FLIGHT_NUMBER'].astype(str)
+        tails = d['TAIL_NUMBER'].astype(str)
+        destinations = d['DESTINATION_AIRPORT'].astype(str)
+        air_times = d['AIR_TIME'].map('{:.0f}'.format)
+        
+        # CUSTOMIZE THIS TEXT - Add whatever info you want!
+        bar_texts = flight_ids + ' | ' + tails + ' | →' + destinations + ' | ' + air_times + 'min'
+        
+        hover_texts = (
+            '<b>' + flight_ids + '</b><br>'
+            + d['ORIGIN_AIRPORT'].astype(str) + ' → ' + destinations + '<br>'
+            + 'Tail: ' + tails + '<br>'
+            + 'Scheduled Dep: ' + d['SCHEDULED_DEPARTURE'].map('{:04d}'.format) + '<br>'
+            + 'Scheduled Arr: ' + d['SCHEDULED_ARRIVAL'].map('{:04d}'.format) + '<br>'
+            + 'Departure Delay: ' + d['DEPARTURE_DELAY'].map('{:.0f}'.format) + ' min<br>'
+            + 'Flight Duration: ' + air_times + ' min<br>'
+            + 'Distance: ' + d['DISTANCE'].map('{:.0f}'.format) + ' miles'
+            + np.where(continues_next_day, '<br><i>(Continues next day)</i>', '')
+        )
+        
+        # All flight bars as a single trace
+        data = [go.Bar(
+            x=end_times - start_times,
+            y=y_centers,
+            base=start_times,
+            orientation='h',
+            width=BAR_HEIGHT,  # Set explicit bar height
+            marker=dict(
+                color=airline_color,
+                line=dict(color='#004080', width=1),
+                opacity=opacities
+            ),
+            text=bar_texts.to_numpy(),
+            textposition='inside',  # Text inside the bar
+            textfont=dict(size=9, color='white', family='Arial Black'),
+            hovertext=hover_texts.to_numpy(),
+            hoverinfo='text',
+            showlegend=False
+        )]
+        
+        # Current time marker
+        current_time = datetime.now()
+        current_hour_decimal = current_time.hour + current_time.minute / 60
+        
+        now_line = dict(
+            type="line",
+            x0=current_hour_decimal,
+            x1=current_hour_decimal,
+            y0=-0.5,
+            y1=len(df_departures) * TOTAL_ROW_HEIGHT,
+            line=dict(color="#E53935", width=3),
+            layer='above'
+        )
+        
+        now_label = dict(
+            x=current_hour_decimal,
+            y=len(df_departures) * TOTAL_ROW_HEIGHT,
+            text=f"NOW {current_time.strftime('%H:%M')}",
+            showarrow=False,
+            yshift=20,
+            font=dict(size=12, color="#E53935", family="Arial Black"),
+            bgcolor="rgba(229, 57, 53, 0.15)",
+            bordercolor="#E53935",
+            borderwidth=2,
+            borderpad=4
+        )
+        
+        # Build the figure in one go - data and full layout passed to the constructor
+        layout = go.Layout(
+            title=dict(
+                text=f"<b>{AIRLINE_NAMES.get(selected_airline, selected_airline)} Departures from {selected_airport}</b><br><sub>{selected_ts.strftime('%B %d, %Y')}</sub>",
+                font=dict(size=20, color='#003366', family='Arial Black'),
+                x=0.5,
+                xanchor='center'
+            ),
+            xaxis=dict(
+                title=dict(
+                    text="<b>Time of Day (24-Hour Format)</b>",
+                    font=dict(size=14, color='#003366', family='Arial Black')
+                ),
+                tickmode='array',
+                tickvals=list(range(0, 25, 2)),
+                ticktext=[f"<b>{h:02d}:00</b>" for h in range(0, 25, 2)],
+                tickfont=dict(size=12, color='#003366', family='Arial'),
+                range=[-0.2, 24.2],
+                # Vertical grid lines every 2 hours (on the ticks)...
+                showgrid=True,
+                gridcolor='rgba(180,180,180,0.4)',
+                gridwidth=1,
+                # ...and lighter dotted lines every hour
+                minor=dict(
+                    dtick=1,
+                    showgrid=True,
+                    gridcolor='rgba(200,200,200,0.2)',
+                    griddash='dot'
+                ),
+                zeroline=False,
+                side='top',
+                showline=True,
+                linewidth=2,
+                linecolor='#003366'
+            ),
+            yaxis=dict(
+                title=dict(
+                    text="<b>Flights</b>",
+                    font=dict(size=14, color='#003366', family='Arial Black')
+                ),
+                showticklabels=False,  # Hide individual flight labels on y-axis
+                showgrid=False,
+                zeroline=False,
+                showline=True,
+                linewidth=2,
+                linecolor='#003366'
+            ),
+            height=1200,  # FIXED HEIGHT
+            hovermode='closest',
+            plot_bgcolor='#F8F9FA',
+            paper_bgcolor='white',
+            bargap=0,  # No gap - we're controlling spacing manually
+            margin=dict(l=100, r=60, t=120, b=60),
+            font=dict(family='Arial'),
+            shapes=[now_line],
+            annotations=[now_label]
+        )
+        fig = go.Figure(data=data, layout=layout)
+        
+        # Display the chart
+        st.plotly_chart(fig, use_container_width=True)
+        
+        # Information boxes
+        st.markdown("---")
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.markdown(f"""
+            <div style='background-color: #E3F2FD; padding: 15px; border-radius: 8px; border-left: 4px solid {airline_color};'>
+                <h4 style='color: #003366; margin-top: 0;'>📊 Chart Details</h4>
+                <p style='color: #004080;'><b>Airline:</b> {AIRLINE_NAMES.get(selected_airline, selected_airline)}</p>
+                <p style='color: #004080;'><b>Airport:</b> {selected_airport}</p>
+                <p style='color: #004080;'><b>Date:</b> {selected_ts.strftime('%b %d, %Y')}</p>
+                <p style='color: #004080;'><b>Departures:</b> {total_flights}</p>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        with col2:
+            st.markdown(f"""
+            <div style='background-color: #FFF3E0; padding: 15px; border-radius: 8px; border-left: 4px solid #FF9800;'>
+                <h4 style='color: #E65100; margin-top: 0;'>🎨 Visual Guide</h4>
+                <p style='color: #E65100;'><span style='background-color: {airline_color}; padding: 2px 8px; color: white; border-radius: 3px;'>{selected_airline}</span> Airline color</p>
+                <p style='color: #E65100;'><span style='color: #E53935;'>●</span> <b>Red Line</b> - Current time</p>
+                <p style='color: #E65100;'><b>Bar Info:</b> Flight# | Tail | Dest | Time</p>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        with col3:
+            st.markdown("""
+            <div style='background-color: #E8F5E9; padding: 15px; border-radius: 8px; border-left: 4px solid #4CAF50;'>
+                <h4 style='color: #2E7D32; margin-top: 0;'>💡 Tips</h4>
+                <p style='color: #2E7D32;'>✈️ Change airline/date/airport above</p>
+                <p style='color: #2E7D32;'>🖱️ Hover over flights for details</p>
+                <p style='color: #2E7D32;'>📊 Each bar = 1 departure</p>
+            </div>
+            """, unsafe_allow_html=True)
+    
+    else:
+        st.warning(f"⚠️ No departures found from {selected_airport} for {AIRLINE_NAMES.get(selected_airline, selected_airline)} on {selected_ts.strftime('%B %d, %Y')}")
+        st.info("💡 Try selecting a different date or airport")
+
+@st.fragment  # Airline/date/airport changes rerun only this page, not the sidebar
+def page_timeline():
+    """
+    Departure schedule for a single airline, date and airport
+    """
     st.title("✈️ Flight Operations Timeline - Single Airport View")
     st.markdown("**Departure Schedule Visualization**")
     st.markdown("---")
@@ -147,7 +754,7 @@ if page == "🛫 Flight Operations Timeline":
     
     with col1:
         # AIRLINE SELECTOR
-        available_airlines = sorted(df['AIRLINE'].unique())
+        available_airlines = get_airlines(df)
         airline_options = [f"{code} - {AIRLINE_NAMES.get(code, 'Unknown')}" for code in available_airlines]
         selected_airline_display = st.selectbox(
             "Select Airline:",
@@ -159,9 +766,6 @@ if page == "🛫 Flight Operations Timeline":
     
     with col2:
         # DATE SELECTOR
-        min_date = df['DATE'].min().date()
-        max_date = df['DATE'].max().date()
-        
         # Default to Feb 1, 2015 if available, otherwise first date
         default_date = pd.to_datetime('2015-02-01').date()
         if default_date < min_date or default_date > max_date:
@@ -174,17 +778,13 @@ if page == "🛫 Flight Operations Timeline":
             max_value=max_date,
             help="Choose any date from the dataset"
         )
+        # Convert once - reused for filtering and every date label below
+        selected_ts = pd.Timestamp(selected_date)
     
     with col3:
         # AIRPORT SELECTOR
-        # First filter by airline and date to get relevant airports
-        df_filtered = df[
-            (df['DATE'] == pd.to_datetime(selected_date)) & 
-            (df['AIRLINE'] == selected_airline) &
-            (df['CANCELLED'] == 0)
-        ]
-        
-        available_airports = sorted(df_filtered['ORIGIN_AIRPORT'].unique())
+        # Only airports this airline departs from on the selected date
+        available_airports = get_departure_airports(df, selected_ts, selected_airline)
         
         if len(available_airports) > 0:
             selected_airport = st.selectbox(
@@ -203,246 +803,17 @@ if page == "🛫 Flight Operations Timeline":
     # MAIN CHART
     # ==================================================================
     if selected_airport:
-        # Filter data: Only DEPARTURES from selected airport, airline, and date
-        df_departures = df[
-            (df['DATE'] == pd.to_datetime(selected_date)) & 
-            (df['AIRLINE'] == selected_airline) &
-            (df['ORIGIN_AIRPORT'] == selected_airport) &
-            (df['CANCELLED'] == 0)
-        ].copy()
-        
-        # Sort by departure time
-        df_departures = df_departures.sort_values('DEPARTURE_HOUR_DECIMAL')
-        
-        if len(df_departures) > 0:
-            # Display summary metrics
-            col1, col2, col3, col4 = st.columns(4)
-            
-            total_flights = len(df_departures)
-            avg_delay = df_departures['DEPARTURE_DELAY'].mean()
-            ontime_pct = (df_departures['DEPARTURE_DELAY'] <= 0).sum() / total_flights * 100
-            max_delay = df_departures['DEPARTURE_DELAY'].max()
-            
-            col1.metric("Departures", f"{total_flights:,}")
-            col2.metric("Average Delay", f"{avg_delay:.1f} min")
-            col3.metric("On-Time %", f"{ontime_pct:.1f}%")
-            col4.metric("Max Delay", f"{max_delay:.0f} min")
-            
-            st.markdown("---")
-            
-            # Create the chart
-            fig = go.Figure()
-            
-            # VERTICAL SPACING PARAMETERS (Adjust these to change appearance)
-            BAR_HEIGHT = 1.5  # Height of each flight bar
-            SPACE_BETWEEN = 0.5  # Space between bars
-            TOTAL_ROW_HEIGHT = BAR_HEIGHT + SPACE_BETWEEN  # 2.0 total per flight
-            
-            # Add vertical grid lines every 2 hours
-            for hour in range(0, 25, 2):
-                fig.add_shape(
-                    type="line",
-                    x0=hour, x1=hour,
-                    y0=-0.5, y1=len(df_departures) * TOTAL_ROW_HEIGHT,
-                    line=dict(color="rgba(180,180,180,0.4)", width=1),
-                    layer='below'
-                )
-            
-            # Add lighter grid lines every 1 hour
-            for hour in range(1, 24, 2):
-                fig.add_shape(
-                    type="line",
-                    x0=hour, x1=hour,
-                    y0=-0.5, y1=len(df_departures) * TOTAL_ROW_HEIGHT,
-                    line=dict(color="rgba(200,200,200,0.2)", width=1, dash="dot"),
-                    layer='below'
-                )
-            
-            # Get airline color
-            airline_color = AIRLINE_COLORS.get(selected_airline, DEFAULT_COLOR)
-            
-            # Plot each flight
-            for idx, (_, flight) in enumerate(df_departures.iterrows()):
-                start_time = flight['DEPARTURE_HOUR_DECIMAL']
-                end_time = flight['ARRIVAL_HOUR_DECIMAL']
-                
-                # Clip to 24-hour window
-                if end_time > 24:
-                    end_time = 24
-                    continues_next_day = True
-                else:
-                    continues_next_day = False
-                
-                # Calculate Y position with proper spacing
-                y_center = idx * TOTAL_ROW_HEIGHT
-                
-                # Create hover text
-                hover_text = (
-                    f"<b>{selected_airline}{flight['FLIGHT_NUMBER']}</b><br>"
-                    f"{flight['ORIGIN_AIRPORT']} → {flight['DESTINATION_AIRPORT']}<br>"
-                    f"Tail: {flight['TAIL_NUMBER']}<br>"
-                    f"Scheduled Dep: {int(flight['SCHEDULED_DEPARTURE']):04d}<br>"
-                    f"Scheduled Arr: {int(flight['SCHEDULED_ARRIVAL']):04d}<br>"
-                    f"Departure Delay: {flight['DEPARTURE_DELAY']:.0f} min<br>"
-                    f"Flight Duration: {flight['AIR_TIME']:.0f} min<br>"
-                    f"Distance: {flight['DISTANCE']:.0f} miles"
-                )
-                
-                if continues_next_day:
-                    hover_text += "<br><i>(Continues next day)</i>"
-                
-                # Color based on delay - use airline brand color
-                if flight['DEPARTURE_DELAY'] > 15:
-                    # Slightly darker for significant delays
-                    bar_color = airline_color
-                    opacity = 0.7
-                else:
-                    bar_color = airline_color
-                    opacity = 0.85
-                
-                # Add the flight bar
-                fig.add_trace(go.Bar(
-                    x=[end_time - start_time],
-                    y=[y_center],
-                    base=start_time,
-                    orientation='h',
-                    width=BAR_HEIGHT,  # Set explicit bar height
-                    marker=dict(
-                        color=bar_color,
-                        line=dict(color='#004080', width=1),
-                        opacity=opacity
-                    ),
-                    # CUSTOMIZE THIS TEXT - Add whatever info you want!
-                    text=f"{selected_airline}{flight['FLIGHT_NUMBER']} | {flight['TAIL_NUMBER']} | →{flight['DESTINATION_AIRPORT']} | {flight['AIR_TIME']:.0f}min",
-                    textposition='inside',  # Text inside the bar
-                    textfont=dict(size=9, color='white', family='Arial Black'),
-                    hovertext=hover_text,
-                    hoverinfo='text',
-                    showlegend=False
-                ))
-            
-            # Add current time marker
-            current_time = datetime.now()
-            current_hour_decimal = current_time.hour + current_time.minute / 60
-            
-            fig.add_shape(
-                type="line",
-                x0=current_hour_decimal,
-                x1=current_hour_decimal,
-                y0=-0.5,
-                y1=len(df_departures) * TOTAL_ROW_HEIGHT,
-                line=dict(color="#E53935", width=3),
-                layer='above'
-            )
-            
-            fig.add_annotation(
-                x=current_hour_decimal,
-                y=len(df_departures) * TOTAL_ROW_HEIGHT,
-                text=f"NOW {current_time.strftime('%H:%M')}",
-                showarrow=False,
-                yshift=20,
-                font=dict(size=12, color="#E53935", family="Arial Black"),
-                bgcolor="rgba(229, 57, 53, 0.15)",
-                bordercolor="#E53935",
-                borderwidth=2,
-                borderpad=4
-            )
-            
-            # Update layout
-            fig.update_layout(
-                title=dict(
-                    text=f"<b>{AIRLINE_NAMES.get(selected_airline, selected_airline)} Departures from {selected_airport}</b><br><sub>{pd.to_datetime(selected_date).strftime('%B %d, %Y')}</sub>",
-                    font=dict(size=20, color='#003366', family='Arial Black'),
-                    x=0.5,
-                    xanchor='center'
-                ),
-                xaxis=dict(
-                    title=dict(
-                        text="<b>Time of Day (24-Hour Format)</b>",
-                        font=dict(size=14, color='#003366', family='Arial Black')
-                    ),
-                    tickmode='array',
-                    tickvals=list(range(0, 25, 2)),
-                    ticktext=[f"<b>{h:02d}:00</b>" for h in range(0, 25, 2)],
-                    tickfont=dict(size=12, color='#003366', family='Arial'),
-                    range=[-0.2, 24.2],
-                    showgrid=False,
-                    zeroline=False,
-                    side='top',
-                    showline=True,
-                    linewidth=2,
-                    linecolor='#003366'
-                ),
-                yaxis=dict(
-                    title=dict(
-                        text="<b>Flights</b>",
-                        font=dict(size=14, color='#003366', family='Arial Black')
-                    ),
-                    showticklabels=False,  # Hide individual flight labels on y-axis
-                    showgrid=False,
-                    zeroline=False,
-                    showline=True,
-                    linewidth=2,
-                    linecolor='#003366'
-                ),
-                height=1200,  # FIXED HEIGHT
-                hovermode='closest',
-                plot_bgcolor='#F8F9FA',
-                paper_bgcolor='white',
-                bargap=0,  # No gap - we're controlling spacing manually
-                margin=dict(l=100, r=60, t=120, b=60),
-                font=dict(family='Arial')
-            )
-            
-            # Display the chart
-            st.plotly_chart(fig, use_container_width=True)
-            
-            # Information boxes
-            st.markdown("---")
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                st.markdown(f"""
-                <div style='background-color: #E3F2FD; padding: 15px; border-radius: 8px; border-left: 4px solid {airline_color};'>
-                    <h4 style='color: #003366; margin-top: 0;'>📊 Chart Details</h4>
-                    <p style='color: #004080;'><b>Airline:</b> {AIRLINE_NAMES.get(selected_airline, selected_airline)}</p>
-                    <p style='color: #004080;'><b>Airport:</b> {selected_airport}</p>
-                    <p style='color: #004080;'><b>Date:</b> {pd.to_datetime(selected_date).strftime('%b %d, %Y')}</p>
-                    <p style='color: #004080;'><b>Departures:</b> {total_flights}</p>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with col2:
-                st.markdown(f"""
-                <div style='background-color: #FFF3E0; padding: 15px; border-radius: 8px; border-left: 4px solid #FF9800;'>
-                    <h4 style='color: #E65100; margin-top: 0;'>🎨 Visual Guide</h4>
-                    <p style='color: #E65100;'><span style='background-color: {airline_color}; padding: 2px 8px; color: white; border-radius: 3px;'>{selected_airline}</span> Airline color</p>
-                    <p style='color: #E65100;'><span style='color: #E53935;'>●</span> <b>Red Line</b> - Current time</p>
-                    <p style='color: #E65100;'><b>Bar Info:</b> Flight# | Tail | Dest | Time</p>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with col3:
-                st.markdown("""
-                <div style='background-color: #E8F5E9; padding: 15px; border-radius: 8px; border-left: 4px solid #4CAF50;'>
-                    <h4 style='color: #2E7D32; margin-top: 0;'>💡 Tips</h4>
-                    <p style='color: #2E7D32;'>✈️ Change airline/date/airport above</p>
-                    <p style='color: #2E7D32;'>🖱️ Hover over flights for details</p>
-                    <p style='color: #2E7D32;'>📊 Each bar = 1 departure</p>
-                </div>
-                """, unsafe_allow_html=True)
-        
-        else:
-            st.warning(f"⚠️ No departures found from {selected_airport} for {AIRLINE_NAMES.get(selected_airline, selected_airline)} on {pd.to_datetime(selected_date).strftime('%B %d, %Y')}")
-            st.info("💡 Try selecting a different date or airport")
-    
+        departure_chart(selected_ts, selected_airline, selected_airport)
     else:
         st.info("👆 Please select an airline, date, and airport above to view the departure schedule")
 
 # ============================================================================
 # PAGE 2: ANALYTICS DASHBOARD
 # ============================================================================
-elif page == "📈 Analytics Dashboard":
+def page_analytics():
+    """
+    Network-wide KPIs and charts for the selected date range and airlines
+    """
     st.title("📊 Aviation Analytics Dashboard")
     st.markdown("**Comprehensive flight performance analysis with interactive filters**")
     st.markdown("---")
@@ -453,30 +824,21 @@ elif page == "📈 Analytics Dashboard":
     # Date range filter
     date_range = st.sidebar.date_input(
         "Date Range:",
-        value=(df['DATE'].min().date(), df['DATE'].max().date()),
-        min_value=df['DATE'].min().date(),
-        max_value=df['DATE'].max().date()
+        value=(min_date, max_date),
+        min_value=min_date,
+        max_value=max_date
     )
     
     # Airline filter
     airlines = st.sidebar.multiselect(
         "Select Airlines:",
-        options=sorted(df['AIRLINE'].unique()),
-        default=sorted(df['AIRLINE'].unique())
+        options=get_airlines(df),
+        default=get_airlines(df)
     )
     
-    # Apply filters
-    if len(date_range) == 2:
-        df_filtered = df[
-            (df['DATE'] >= pd.to_datetime(date_range[0])) &
-            (df['DATE'] <= pd.to_datetime(date_range[1])) &
-            (df['AIRLINE'].isin(airlines))
-        ].copy()
-    else:
-        df_filtered = df[df['AIRLINE'].isin(airlines)].copy()
-    
-    # Filter active flights only
-    df_active = df_filtered[df_filtered['CANCELLED'] == 0].copy()
+    # Cache key for the aggregations below (date range is ignored until both ends are picked)
+    start_date, end_date = date_range if len(date_range) == 2 else (None, None)
+    filters = (df, tuple(sorted(airlines)), start_date, end_date)
     
     # =======================================================================
     # KEY METRICS ROW
@@ -485,11 +847,7 @@ elif page == "📈 Analytics Dashboard":
     
     col1, col2, col3, col4, col5 = st.columns(5)
     
-    total_flights = len(df_filtered)
-    cancelled_flights = df_filtered['CANCELLED'].sum()
-    avg_dep_delay = df_active['DEPARTURE_DELAY'].mean()
-    avg_arr_delay = df_active['ARRIVAL_DELAY'].mean()
-    ontime_rate = (df_active['DEPARTURE_DELAY'] <= 0).sum() / len(df_active) * 100 if len(df_active) > 0 else 0
+    total_flights, cancelled_flights, avg_dep_delay, avg_arr_delay, ontime_rate = get_kpis(*filters)
     
     col1.metric("Total Flights", f"{total_flights:,}")
     col2.metric("Cancellations", f"{cancelled_flights:,}", 
@@ -506,25 +864,27 @@ elif page == "📈 Analytics Dashboard":
     # =======================================================================
     st.subheader("📅 Daily Flight Operations & Delays")
     
-    daily_stats = df_filtered.groupby('DATE').agg({
-        'FLIGHT_NUMBER': 'count',
-        'DEPARTURE_DELAY': 'mean',
-        'CANCELLED': 'sum'
-    }).reset_index()
-    daily_stats.columns = ['DATE', 'Total_Flights', 'Avg_Delay', 'Cancellations']
+    daily_stats = get_daily_stats(*filters)
+    
+    # Plot weekly averages instead of daily points for very long date ranges
+    MAX_DAILY_POINTS = 400
+    if len(daily_stats) > MAX_DAILY_POINTS:
+        daily_stats = daily_stats.set_index('DATE').resample('W').mean().reset_index()
+        st.caption("📉 Long date range - showing weekly averages of the daily values")
     
     fig1 = make_subplots(specs=[[{"secondary_y": True}]])
     
+    # Scattergl draws with WebGL, which stays smooth on long date ranges
     fig1.add_trace(
-        go.Scatter(x=daily_stats['DATE'], y=daily_stats['Total_Flights'],
-                  name="Flight Volume", line=dict(color='#0078D2', width=2),
-                  fill='tozeroy', fillcolor='rgba(0,120,210,0.1)'),
+        go.Scattergl(x=daily_stats['DATE'], y=daily_stats['Total_Flights'],
+                    name="Flight Volume", line=dict(color='#0078D2', width=2),
+                    fill='tozeroy', fillcolor='rgba(0,120,210,0.1)'),
         secondary_y=False
     )
     
     fig1.add_trace(
-        go.Scatter(x=daily_stats['DATE'], y=daily_stats['Avg_Delay'],
-                  name="Avg Delay", line=dict(color='#C8102E', width=2)),
+        go.Scattergl(x=daily_stats['DATE'], y=daily_stats['Avg_Delay'],
+                    name="Avg Delay", line=dict(color='#C8102E', width=2)),
         secondary_y=True
     )
     
@@ -547,13 +907,7 @@ elif page == "📈 Analytics Dashboard":
     with col1:
         st.subheader("🏢 Airline Performance")
         
-        airline_perf = df_active.groupby('AIRLINE').agg({
-            'FLIGHT_NUMBER': 'count',
-            'DEPARTURE_DELAY': 'mean',
-            'ARRIVAL_DELAY': 'mean'
-        }).reset_index()
-        airline_perf.columns = ['Airline', 'Flights', 'Dep_Delay', 'Arr_Delay']
-        airline_perf = airline_perf.sort_values('Arr_Delay')
+        airline_perf = get_airline_performance(*filters)
         
         fig2 = go.Figure()
         fig2.add_trace(go.Bar(
@@ -583,10 +937,10 @@ elif page == "📈 Analytics Dashboard":
     with col2:
         st.subheader("⏰ Hourly Delay Pattern")
         
-        hourly = df_active.groupby('DEPARTURE_HOUR')['DEPARTURE_DELAY'].mean().reset_index()
+        hourly = get_hourly_delays(*filters)
         
         fig3 = go.Figure()
-        fig3.add_trace(go.Scatter(
+        fig3.add_trace(go.Scattergl(
             x=hourly['DEPARTURE_HOUR'],
             y=hourly['DEPARTURE_DELAY'],
             mode='lines+markers',
@@ -618,10 +972,7 @@ elif page == "📈 Analytics Dashboard":
     col1, col2 = st.columns([2, 1])
     
     with col1:
-        delay_causes = df_active[df_active['ARRIVAL_DELAY'] > 0][
-            ['AIR_SYSTEM_DELAY', 'SECURITY_DELAY', 'AIRLINE_DELAY',
-             'LATE_AIRCRAFT_DELAY', 'WEATHER_DELAY']
-        ].sum()
+        delay_causes = get_delay_causes(*filters)
         
         fig4 = go.Figure(data=[go.Pie(
             labels=['Air System', 'Security', 'Airline', 'Late Aircraft', 'Weather'],
@@ -660,52 +1011,41 @@ elif page == "📈 Analytics Dashboard":
 # ============================================================================
 # PAGE 3: ROOT CAUSE ANALYSIS
 # ============================================================================
-elif page == "🔍 Root Cause Analysis":
+def page_root_cause():
+    """
+    Delay severity, airport hotspots, weekly patterns and recommendations
+    """
     st.title("🔬 Root Cause & Hotspot Analysis")
     st.markdown("**Deep dive into delay patterns, problem airports, and operational insights**")
     st.markdown("---")
     
-    # Filter to only delayed flights
-    df_delayed = df[(df['ARRIVAL_DELAY'] > 0) & (df['CANCELLED'] == 0)].copy()
+    # The page's summaries come from a separate build step - stop early if it wasn't run...
+    version = get_aggregates_version()
+    if version is None:
+        st.error(f"❌ {AGGREGATES_FILE} not found. Run `python build_aggregates.py` (after `python build_parquet.py`) and reload the page.")
+        return
+    
+    # ...or if it was built from a different flights.parquet than the one on disk
+    if get_aggregates_source(version) != get_data_source():
+        st.error(f"❌ {AGGREGATES_FILE} is out of date with {DATA_FILE}. Run `python build_aggregates.py` and reload the page.")
+        return
     
     # =======================================================================
     # SECTION 1: DELAY SEVERITY BREAKDOWN
     # =======================================================================
     st.subheader("📊 Delay Severity Distribution")
     
-    # Categorize delays
-    df_delayed['DELAY_CATEGORY'] = pd.cut(
-        df_delayed['ARRIVAL_DELAY'],
-        bins=[0, 15, 30, 60, 120, float('inf')],
-        labels=['Minor (0-15m)', 'Moderate (15-30m)', 'Significant (30-60m)', 
-                'Major (1-2h)', 'Severe (>2h)']
-    )
-    
-    delay_dist = df_delayed['DELAY_CATEGORY'].value_counts().sort_index()
+    total_delayed, severe_pct, avg_delay_delayed, weather_delays, total_delay_mins = get_delayed_flight_stats(version)
     
     col1, col2 = st.columns([2, 1])
     
     with col1:
-        fig = px.bar(
-            x=delay_dist.index,
-            y=delay_dist.values,
-            labels={'x': 'Delay Category', 'y': 'Number of Flights'},
-            title='How Severe Are the Delays?',
-            color=delay_dist.values,
-            color_continuous_scale='Reds'
-        )
-        fig.update_layout(height=400, showlegend=False, plot_bgcolor='white')
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(get_severity_figure(version), use_container_width=True)
     
     with col2:
         st.markdown("### Key Findings")
-        total_delayed = len(df_delayed)
-        severe_pct = (df_delayed['ARRIVAL_DELAY'] > 120).sum() / total_delayed * 100
-        
         st.metric("Total Delayed Flights", f"{total_delayed:,}")
         st.metric("Severe Delays (>2h)", f"{severe_pct:.1f}%")
-        
-        avg_delay_delayed = df_delayed['ARRIVAL_DELAY'].mean()
         st.metric("Avg Delay (delayed flights)", f"{avg_delay_delayed:.1f} min")
     
     st.markdown("---")
@@ -720,47 +1060,19 @@ elif page == "🔍 Root Cause Analysis":
     with col1:
         st.markdown("#### **Worst Departure Airports**")
         
-        dept_airports = df[df['CANCELLED'] == 0].groupby('ORIGIN_AIRPORT').agg({
-            'FLIGHT_NUMBER': 'count',
-            'DEPARTURE_DELAY': 'mean'
-        }).reset_index()
-        dept_airports.columns = ['Airport', 'Flights', 'Avg_Delay']
-        dept_airports = dept_airports[dept_airports['Flights'] >= 100]  # Min 100 flights
-        dept_airports = dept_airports.sort_values('Avg_Delay', ascending=False).head(10)
-        
-        fig = px.bar(
-            dept_airports,
-            x='Avg_Delay',
-            y='Airport',
-            orientation='h',
-            title='Top 10 Airports with Highest Departure Delays',
-            color='Avg_Delay',
-            color_continuous_scale='Reds'
+        fig = get_worst_airports_figure(
+            version, 'ORIGIN_AIRPORT', 'DEPARTURE_DELAY',
+            'Top 10 Airports with Highest Departure Delays', 'Reds'
         )
-        fig.update_layout(height=400, plot_bgcolor='white')
         st.plotly_chart(fig, use_container_width=True)
     
     with col2:
         st.markdown("#### **Worst Arrival Airports**")
         
-        arr_airports = df[df['CANCELLED'] == 0].groupby('DESTINATION_AIRPORT').agg({
-            'FLIGHT_NUMBER': 'count',
-            'ARRIVAL_DELAY': 'mean'
-        }).reset_index()
-        arr_airports.columns = ['Airport', 'Flights', 'Avg_Delay']
-        arr_airports = arr_airports[arr_airports['Flights'] >= 100]
-        arr_airports = arr_airports.sort_values('Avg_Delay', ascending=False).head(10)
-        
-        fig = px.bar(
-            arr_airports,
-            x='Avg_Delay',
-            y='Airport',
-            orientation='h',
-            title='Top 10 Airports with Highest Arrival Delays',
-            color='Avg_Delay',
-            color_continuous_scale='Oranges'
+        fig = get_worst_airports_figure(
+            version, 'DESTINATION_AIRPORT', 'ARRIVAL_DELAY',
+            'Top 10 Airports with Highest Arrival Delays', 'Oranges'
         )
-        fig.update_layout(height=400, plot_bgcolor='white')
         st.plotly_chart(fig, use_container_width=True)
     
     st.markdown("---")
@@ -770,67 +1082,15 @@ elif page == "🔍 Root Cause Analysis":
     # =======================================================================
     st.subheader("📆 When Do Delays Happen?")
     
-    # Day of week analysis
-    day_names = {1: 'Monday', 2: 'Tuesday', 3: 'Wednesday', 4: 'Thursday', 
-                 5: 'Friday', 6: 'Saturday', 7: 'Sunday'}
-    
-    df_active = df[df['CANCELLED'] == 0].copy()
-    df_active['DAY_NAME'] = df_active['DAY_OF_WEEK'].map(day_names)
-    
-    dow_stats = df_active.groupby('DAY_NAME').agg({
-        'FLIGHT_NUMBER': 'count',
-        'DEPARTURE_DELAY': 'mean',
-        'ARRIVAL_DELAY': 'mean'
-    }).reset_index()
-    
-    # Reorder to start with Monday
-    day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-    dow_stats['DAY_NAME'] = pd.Categorical(dow_stats['DAY_NAME'], categories=day_order, ordered=True)
-    dow_stats = dow_stats.sort_values('DAY_NAME')
+    delay_fig, volume_fig = get_day_of_week_figures(version)
     
     col1, col2 = st.columns(2)
     
     with col1:
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=dow_stats['DAY_NAME'],
-            y=dow_stats['DEPARTURE_DELAY'],
-            mode='lines+markers',
-            name='Departure',
-            line=dict(color='#FF9800', width=3),
-            marker=dict(size=10)
-        ))
-        fig.add_trace(go.Scatter(
-            x=dow_stats['DAY_NAME'],
-            y=dow_stats['ARRIVAL_DELAY'],
-            mode='lines+markers',
-            name='Arrival',
-            line=dict(color='#F44336', width=3),
-            marker=dict(size=10)
-        ))
-        
-        fig.update_layout(
-            title='Average Delays by Day of Week',
-            xaxis_title='Day',
-            yaxis_title='Average Delay (minutes)',
-            height=400,
-            plot_bgcolor='white'
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(delay_fig, use_container_width=True)
     
     with col2:
-        fig = px.bar(
-            dow_stats,
-            x='DAY_NAME',
-            y='FLIGHT_NUMBER',
-            title='Flight Volume by Day of Week',
-            color='FLIGHT_NUMBER',
-            color_continuous_scale='Blues'
-        )
-        fig.update_layout(height=400, plot_bgcolor='white', showlegend=False)
-        fig.update_xaxes(title='Day')
-        fig.update_yaxes(title='Number of Flights')
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(volume_fig, use_container_width=True)
     
     st.markdown("---")
     
@@ -839,13 +1099,16 @@ elif page == "🔍 Root Cause Analysis":
     # =======================================================================
     st.subheader("💡 Operational Insights & Recommendations")
     
+    # Per-hour and per-carrier means, looked up once before laying out the cards
+    hourly = get_delay_by_hour(version)
+    carrier_avg = get_carrier_delays(version)
+    
     col1, col2, col3 = st.columns(3)
     
     with col1:
         st.markdown("### 🎯 Peak Problem Times")
         
         # Find worst hour
-        hourly = df_active.groupby('DEPARTURE_HOUR')['DEPARTURE_DELAY'].mean()
         worst_hour = hourly.idxmax()
         worst_delay = hourly.max()
         
@@ -860,7 +1123,6 @@ elif page == "🔍 Root Cause Analysis":
     with col2:
         st.markdown("### 🏢 Best/Worst Carriers")
         
-        carrier_avg = df_active.groupby('AIRLINE')['ARRIVAL_DELAY'].mean().sort_values()
         best_carrier = carrier_avg.index[0]
         worst_carrier = carrier_avg.index[-1]
         
@@ -877,8 +1139,6 @@ elif page == "🔍 Root Cause Analysis":
     with col3:
         st.markdown("### 🌦️ Weather Impact")
         
-        weather_delays = df_delayed['WEATHER_DELAY'].sum()
-        total_delay_mins = df_delayed['ARRIVAL_DELAY'].sum()
         weather_pct = (weather_delays / total_delay_mins * 100)
         
         st.warning(f"""
@@ -891,6 +1151,27 @@ elif page == "🔍 Root Cause Analysis":
         **Note:** Weather is often unavoidable but can be mitigated with better planning.
         """)
 
+# ============================================================================
+# NAVIGATION - SELECT PAGE
+# ============================================================================
+PAGES = {
+    "🛫 Flight Operations Timeline": page_timeline,
+    "📈 Analytics Dashboard": page_analytics,
+    "🔍 Root Cause Analysis": page_root_cause,
+}
+
+st.sidebar.title("📊 Navigation")
+page = st.sidebar.radio(
+    "Select Page:",
+    list(PAGES)
+)
+
+st.sidebar.markdown("---")
+st.sidebar.info("💡 **Tip:** This dashboard demonstrates data analysis and visualization skills for aviation operations roles.")
+
+# Only the selected page runs
+PAGES[page]()
+
 # ============================================================================
 # FOOTER
 # ============================================================================